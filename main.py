@@ -10,15 +10,30 @@
 
 import argparse
 import base64
+import datetime
+import json
 import os
 import re
+import sys
 
 import github
 import yaml
-from tqdm import tqdm
 
 END_CHANGELOG_SIGNATURE = r'\* *This CHANGELOG was automatically generated by [auto-generate-changelog](https://github.com/BobAnkh/auto-generate-changelog)*'
 BEGIN_CHANGELOG_TITLE = '# CHANGELOG'
+CACHE_PATH = '.changelog-cache.json'
+
+_END_WITH_NL = END_CHANGELOG_SIGNATURE + '\n'
+_END_LEN = len(_END_WITH_NL)
+_BEGIN_LEN = len(BEGIN_CHANGELOG_TITLE)
+
+_HIDE = re.compile(
+    r'<!-- HIDE IN CHANGELOG BEGIN -->(?:.|\n)*?<!-- HIDE IN CHANGELOG END -->'
+)
+_MULTI_NL = re.compile(r'\n{3,}')
+_SEP = re.compile(r'(?:^|\n\n)## ')
+_TAG = re.compile(r'\[([^\]]+)\]')
+_TYPE_SPLIT = re.compile(r'\s?,\s?')
 
 
 def argument_parser():
@@ -82,8 +97,12 @@ def set_env_from_file(file, args, prefix='INPUT'):
         args (object): argument
         prefix (str, optional): prefix of env. Defaults to 'INPUT'.
     '''
-    f = open(file, encoding='utf-8')
-    y = yaml.safe_load(f)
+    try:
+        from yaml import CSafeLoader as _Loader
+    except ImportError:
+        from yaml import SafeLoader as _Loader
+    with open(file, encoding='utf-8') as f:
+        y = yaml.load(f, Loader=_Loader)
     for job in y['jobs'].values():
         for step in job['steps']:
             if re.match(r'BobAnkh/auto-generate-changelog', step['uses']):
@@ -114,6 +133,37 @@ def set_env_from_file(file, args, prefix='INPUT'):
         set_local_env(param, tmp, prefix)
 
 
+def load_cache(path):
+    '''
+    Load the release content cache from disk
+
+    Args:
+        path (str): path to the cache file
+
+    Returns:
+        dict: release tag mapped to [commit_sha, content]. Empty when the
+        file is missing or unreadable.
+    '''
+    try:
+        with open(path, encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def save_cache(path, cache):
+    '''
+    Save the release content cache to disk
+
+    Args:
+        path (str): path to the cache file
+        cache (dict): release tag mapped to [commit_sha, content]
+    '''
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(cache, f)
+
+
 class GithubChangelog:
     '''
     Class for data interface of Github
@@ -159,15 +209,85 @@ class GithubChangelog:
         self.default_scope = default_scope
         self.suppress_unscoped = suppress_unscoped
         self.replace_empty_release_info = replace_empty_release_info
+        self._pr_cache = {}
+        self._cache = load_cache(CACHE_PATH)
+        self._commits = []
+        self._commit_by_sha = {}
         # Use PyGithub to login to the repository
         # References: https://pygithub.readthedocs.io/en/latest/github_objects/Repository.html#github.Repository.Repository
         print('access token is ' + access_token)
-        g = github.Github(access_token)
+        g = github.Github(access_token, per_page=100)
         self.repo = g.get_repo(repo_name)
         self.author = github.GithubObject.NotSet if committer == '' else github.InputGitAuthor(
             committer.split(' ')[0],
             committer.split(' ')[1])
 
+    def _graphql_query(self, query):
+        '''
+        POST a GraphQL query and normalize GraphQL-level failures
+
+        GraphQL reports errors (rate limiting, missing token scopes) as
+        HTTP 200 with an errors list and null data, so surface them as
+        github.GithubException like any REST failure instead of letting
+        the callers crash on the null payload.
+
+        Args:
+            query (str): the GraphQL document to POST
+
+        Returns:
+            dict: the data field of the response
+        '''
+        _, response = self.repo._requester.requestJsonAndCheck(
+            'POST', '/graphql', input={'query': query})
+        errors = response.get('errors')
+        if errors or response.get('data') is None:
+            status = 403 if any(
+                e.get('type') == 'RATE_LIMITED' for e in errors or []) else 502
+            raise github.GithubException(status, {
+                'message': 'GraphQL query failed',
+                'errors': errors
+            }, None)
+        return response['data']
+
+    def _fetch_releases_graphql(self):
+        '''
+        Fetch release metadata in bulk via GraphQL
+
+        Pages releases(first: 100) newest-first through cursors and returns
+        plain dicts, so no lazy Release attribute access can trigger an
+        extra request.
+
+        Returns:
+            list: dicts with tag_name, html_url, body and created_at
+        '''
+        owner, name = self.repo.full_name.split('/')
+        releases = []
+        cursor = ''
+        while True:
+            after = f', after: "{cursor}"' if cursor else ''
+            query = (
+                f'query {{ repository(owner: "{owner}", name: "{name}") {{ '
+                f'releases(first: 100, orderBy: {{field: CREATED_AT, direction: DESC}}{after}) {{ '
+                'nodes { tagName url description createdAt } '
+                'pageInfo { endCursor hasNextPage } } } }')
+            connection = self._graphql_query(query)['repository']['releases']
+            for node in connection['nodes']:
+                releases.append({
+                    'tag_name':
+                    node['tagName'],
+                    'html_url':
+                    node['url'],
+                    'body':
+                    node['description'] or '',
+                    'created_at':
+                    datetime.datetime.strptime(node['createdAt'],
+                                               '%Y-%m-%dT%H:%M:%SZ')
+                })
+            if not connection['pageInfo']['hasNextPage']:
+                break
+            cursor = connection['pageInfo']['endCursor']
+        return releases
+
     def get_data(self):
         '''
         Get data from Github to get/generate changelog for every releases
@@ -175,15 +295,19 @@ class GithubChangelog:
         # get file content
         self.get_exist_changelog()
         # get release info
-        releases = self.repo.get_releases()
-        regenerate_releases = [r.tag_name for r in releases]
+        releases = self._fetch_releases_graphql()
+        regenerate_releases = [r['tag_name'] for r in releases]
         if self.regenerate_count < 0:
             pass
         else:
             regenerate_releases = regenerate_releases[0:self.regenerate_count]
+        # releases the REGENERATE_COUNT input explicitly asks to rebuild must
+        # never be served from the disk cache
+        requested_regenerations = set(regenerate_releases)
         for r in releases:
-            if r.tag_name not in self.release_in_changelog and r.tag_name not in regenerate_releases:
-                regenerate_releases.append(r.tag_name)
+            if r['tag_name'] not in self.release_in_changelog and r[
+                    'tag_name'] not in regenerate_releases:
+                regenerate_releases.append(r['tag_name'])
         if self.unreleased_commits:
             regenerate_releases.append('Unreleased')
             self.releases['Unreleased'] = {
@@ -193,25 +317,56 @@ class GithubChangelog:
                 'commit_sha': '',
                 'content': ''
             }
+        # Steady-state short-circuit: when nothing is pending regeneration and
+        # every release is already in the changelog, reuse the parsed content
+        # and skip the tags and commits traversal entirely
+        pending = [
+            r for r in regenerate_releases
+            if r not in self.release_in_changelog
+        ]
+        if not pending and not self.unreleased_commits and self.regenerate_count == 0:
+            print(
+                '[INFO] All releases are already in the changelog, nothing to regenerate'
+            )
+            for release in releases:
+                self.releases[release['tag_name']] = {
+                    'html_url': release['html_url'],
+                    'body': release['body'].replace('\r\n', '\n').strip('\n'),
+                    'created_at': release['created_at'],
+                    'commit_sha': '',
+                    'content': self.release_in_changelog[release['tag_name']]
+                }
+            return
         print('[INFO] Regenerate releases:', regenerate_releases)
+        regenerate_set = set(regenerate_releases)
         # get tags
-        tags = self.repo.get_tags()
-        tags_sha = {}
-        for tag in tags:
-            tags_sha[tag.name] = tag.commit.sha
+        tags_sha = self._fetch_tags_sha()
         print('tags_sha: ', tags_sha)
         # get all meta data for releases
         for release in releases:
-            commit_sha = tags_sha[release.tag_name] if release.tag_name in tags_sha else ''
+            tag_name = release['tag_name']
+            commit_sha = tags_sha[tag_name] if tag_name in tags_sha else ''
             print('commit_sha: ', commit_sha)
-            release_content = self.release_in_changelog[release.tag_name] if release.tag_name in self.release_in_changelog and release.tag_name not in regenerate_releases else ''
-            self.releases[release.tag_name] = {
-                'html_url': release.html_url,
-                'body': re.sub(r'\r\n', r'\n', release.body).strip('\n'),
-                'created_at': release.created_at,
+            release_content = self.release_in_changelog[tag_name] if tag_name in self.release_in_changelog and tag_name not in regenerate_set else ''
+            self.releases[tag_name] = {
+                'html_url': release['html_url'],
+                'body': release['body'].replace('\r\n', '\n').strip('\n'),
+                'created_at': release['created_at'],
                 'commit_sha': commit_sha,
                 'content': release_content
             }
+        # reuse content cached by a previous run whenever the release still
+        # points at the same tip commit, unless its regeneration was
+        # explicitly requested
+        for tag in list(regenerate_set):
+            if tag in requested_regenerations:
+                continue
+            cached = self._cache.get(tag)
+            if cached and tag in self.releases and cached[0] != '' and cached[
+                    0] == tags_sha.get(tag):
+                print('[INFO] Release', tag, 'unchanged, content from cache')
+                self.releases[tag]['content'] = cached[1]
+                regenerate_set.discard(tag)
         release_commit_sha_list = {
             self.releases[x]['commit_sha']: x
             for x in self.releases
@@ -219,49 +374,82 @@ class GithubChangelog:
         print('release_commit_sha_list: ', release_commit_sha_list)
 
         cur_release = 'Unreleased'
-        # Get commits
-        commits = self.get_github_commits()
         selected_commits = []
-        if len(regenerate_releases) > 0:
-            for commit in commits:
-                if commit.sha in release_commit_sha_list:
-                    print('commit.sha: ', commit.sha)
-                    print('commit message: ', commit.commit.message.split("\n\n")[0])
-                    if cur_release in regenerate_releases:
-                        release_content, status_code = self.get_release_content(
+        if regenerate_set:
+            # A release's commits reach back to the boundary commit of the
+            # next older release, so the walk never needs anything older than
+            # that commit. Resolve its real committer date with one commit
+            # lookup: the release's own created_at is when its notes were
+            # published, which can be days later. Keep the full history when
+            # an oldest release has to be regenerated or the boundary commit
+            # is unknown.
+            release_order = [r['tag_name'] for r in releases]
+            since = github.GithubObject.NotSet
+            bound_tags = []
+            for target in regenerate_set:
+                idx = -1 if target == 'Unreleased' else release_order.index(
+                    target)
+                if idx + 1 >= len(release_order):
+                    bound_tags = []
+                    break
+                bound_tags.append(release_order[idx + 1])
+            try:
+                if bound_tags:
+                    bound_tag = min(
+                        bound_tags,
+                        key=lambda tag: self.releases[tag]['created_at'])
+                    bound_sha = self.releases[bound_tag]['commit_sha']
+                    if bound_sha != '':
+                        since = self.repo.get_commit(
+                            bound_sha).commit.committer.date
+                # Get commits
+                self.get_github_commits(since)
+                self._prefetch_pulls_for_commits(list(self._commit_by_sha))
+            except github.GithubException as e:
+                print(
+                    "[ERROR] Failed to fetch commits and pull requests, status code: "
+                    + str(e.status) + ", message: " + str(e.data))
+                self._commits = []
+            for commit in self._commits:
+                commit['pr_links'] = self._pr_cache.get(commit['sha'], [])
+            for commit in self._commits:
+                mapped_release = release_commit_sha_list.get(commit['sha'])
+                if mapped_release is not None:
+                    print('commit.sha: ', commit['sha'])
+                    print('commit message: ', commit['message'].split("\n\n")[0])
+                    if cur_release in regenerate_set:
+                        release_content = self.get_release_content(
                             cur_release, selected_commits)
-                        if status_code != 0 and status_code != 200:
-                            selected_commits = []
-                            print(
-                                "[ERROR] Failed to get release content, status code: "
-                                + str(status_code))
-                            break
                         self.releases[cur_release]['content'] = release_content
-                        regenerate_releases.remove(cur_release)
-                        cur_release = release_commit_sha_list[commit.sha]
-                        if len(regenerate_releases) <= 0:
+                        if cur_release != 'Unreleased':
+                            self._cache[cur_release] = [
+                                self.releases[cur_release]['commit_sha'],
+                                release_content
+                            ]
+                        regenerate_set.discard(cur_release)
+                        cur_release = mapped_release
+                        if not regenerate_set:
                             selected_commits = []
                             print(
                                 "[INFO] All regenerate_releases are generated")
                             break
                     else:
-                        cur_release = release_commit_sha_list[commit.sha]
+                        cur_release = mapped_release
                     selected_commits = [commit]
                 else:
                     selected_commits.append(commit)
-        if len(selected_commits) > 0 and cur_release in regenerate_releases:
-            release_content, status_code = self.get_release_content(
+        if len(selected_commits) > 0 and cur_release in regenerate_set:
+            release_content = self.get_release_content(
                 cur_release, selected_commits)
-            if status_code != 0 and status_code != 200:
-                selected_commits = []
-                print("[ERROR] Failed to get release content, status code: " +
-                      str(status_code))
-            else:
-                self.releases[cur_release]['content'] = release_content
-                regenerate_releases.remove(cur_release)
-        if len(regenerate_releases) > 0:
+            self.releases[cur_release]['content'] = release_content
+            if cur_release != 'Unreleased':
+                self._cache[cur_release] = [
+                    self.releases[cur_release]['commit_sha'], release_content
+                ]
+            regenerate_set.discard(cur_release)
+        if regenerate_set:
             print("[WARN] Failed to generate all the releases, left: " +
-                  str(regenerate_releases))
+                  str(list(regenerate_set)))
 
     def get_exist_changelog(self):
         '''
@@ -279,9 +467,9 @@ class GithubChangelog:
             self.file_exists = True
             self.path = contents.path
             self.sha = contents.sha
-            base = contents.content
-            base = base.replace('\n', '')
-            self.changelog = base64.b64decode(base).decode('utf-8')
+            # b64decode ignores the newlines GitHub inserts, no need to strip
+            # them with a full-string copy first
+            self.changelog = base64.b64decode(contents.content).decode('utf-8')
             self.analyze_changelog()
 
     def analyze_changelog(self): 
@@ -289,33 +477,63 @@ class GithubChangelog:
         body_content = ''
         if self.changelog.startswith(
                 BEGIN_CHANGELOG_TITLE) and self.changelog.endswith(
-                    END_CHANGELOG_SIGNATURE + '\n'):
-            body_content = self.changelog[len(BEGIN_CHANGELOG_TITLE
-                                              ):-len(END_CHANGELOG_SIGNATURE +
-                                                     '\n')]
+                    _END_WITH_NL):
+            body_content = self.changelog[_BEGIN_LEN:-_END_LEN]
         else:
             if self.changelog != '':
                 print(
                     '\n[WARN] The changelog is not in the correct format! Will clear the changelog.'
                 )
                 return
-        for release_body in body_content.split('\n\n## '):
+        # slice each release block out of body_content by its separator
+        # offsets instead of splitting the whole string up front
+        separators = list(_SEP.finditer(body_content))
+        for i, sep in enumerate(separators):
+            end = separators[i + 1].start() if i + 1 < len(
+                separators) else len(body_content)
+            release_body = body_content[sep.end():end]
             if release_body.startswith('Unreleased') or release_body == '':
                 continue
-            search_res = re.search(r'\[.*?\]', release_body)
+            search_res = _TAG.search(release_body)
             if search_res is None:
                 print(
                     '[WARN] This part is not in the correct format! Will ignore this part.',
-                    release_body.split('\n')[0])
+                    release_body.split('\n', 1)[0])
                 continue
-            release_tag = search_res.group()[1:-1]
+            release_tag = search_res.group(1)
             self.release_in_changelog[
                 release_tag] = '## ' + release_body.strip('\n')
 
-    def get_github_commits(self):
+    def _fetch_tags_sha(self):
+        '''
+        Build a tag name -> commit sha dict straight from the tags endpoint
+
+        Pages through /tags with per_page=100 and reads the sha out of the
+        raw JSON payload, without inflating a Tag/Commit object per entry.
+
+        Returns:
+            dict: tag name mapped to the sha of its commit
+        '''
+        tags_sha = {}
+        url = f'{self.repo.url}/tags'
+        parameters = {'per_page': 100}
+        while url:
+            headers, data = self.repo._requester.requestJsonAndCheck(
+                'GET', url, parameters=parameters)
+            for tag in data:
+                tags_sha[tag['name']] = tag['commit']['sha']
+            url = None
+            parameters = None
+            for link in (headers.get('link') or '').split(', '):
+                if link.endswith('rel="next"'):
+                    url = link[link.index('<') + 1:link.index('>')]
+                    break
+        return tags_sha
+
+    def get_github_commits(self, since=github.GithubObject.NotSet):
         # Get commits
         try:
-            commits = self.repo.get_commits(sha=self.branch)
+            commits = self.repo.get_commits(sha=self.branch, since=since)
             if commits.totalCount == 0:
                 print('[WARN] No commits found on branch', self.branch)
                 message = {}
@@ -324,10 +542,9 @@ class GithubChangelog:
                     'documentation_url'] = 'https://docs.github.com/rest/commits/commits#list-commits'
                 raise github.GithubException.UnknownObjectException(
                     404, message)
-            return commits
         except github.GithubException as e:
             if e.status == 404:
-                commits = self.repo.get_commits()
+                commits = self.repo.get_commits(since=since)
                 if commits.totalCount == 0:
                     print('[WARN] No commits found on default branch')
                     message = {}
@@ -336,59 +553,76 @@ class GithubChangelog:
                         'documentation_url'] = 'https://docs.github.com/rest/commits/commits#list-commits'
                     raise github.GithubException.UnknownObjectException(
                         404, message)
-                return commits
             else:
                 raise github.GithubException(e.status, e.data)
+        # Flatten each commit into a plain dict while materializing the
+        # PaginatedList: the list payload already carries everything the
+        # changelog needs, and dict reads can never trigger the lazy
+        # per-attribute fetches a Commit object can
+        self._commits = [{
+            'sha': c.sha,
+            'url': c.html_url,
+            'message': c.commit.message,
+            'pr_links': []
+        } for c in commits]
+        self._commit_by_sha = {c['sha']: c for c in self._commits}
+        return self._commits
+
+    def _prefetch_pulls_for_commits(self, shas):
+        '''
+        Batch-fetch the pull requests associated with commits via GraphQL
+
+        Aliases every commit sha in one GraphQL document (chunked by 100, the
+        GraphQL node limit) instead of issuing one REST request per commit.
+        Results are memoized in self._pr_cache as sha -> list of pr_links.
+
+        Args:
+            shas (list): list of commit sha to fetch pull requests for
+        '''
+        owner, name = self.repo.full_name.split('/')
+        shas = [sha for sha in shas if sha not in self._pr_cache]
+        for start in range(0, len(shas), 100):
+            chunk = shas[start:start + 100]
+            fields = '\n'.join(
+                f'c{i}: object(oid: "{sha}") {{ ... on Commit {{ associatedPullRequests(first: 5) {{ nodes {{ number url }} }} }} }}'
+                for i, sha in enumerate(chunk))
+            query = f'query {{ repository(owner: "{owner}", name: "{name}") {{ {fields} }} }}'
+            repository = self._graphql_query(query)['repository']
+            for i, sha in enumerate(chunk):
+                node = repository.get(f'c{i}')
+                pr_links = []
+                if node:
+                    for pull in node['associatedPullRequests']['nodes']:
+                        pr_links.append(
+                            f''' ([#{pull['number']}]({pull['url']}))''')
+                self._pr_cache[sha] = pr_links
 
     def get_release_content(self, release_tag, commits):
         '''
         Get release content from processed commits
         '''
         selected_commits = []
-        status_code = 0
-        try:
-            for commit in commits:
-                message = commit.commit.message.split('\n\n')
-                message_head = message[0]
-                if message_head[-3:] == '...' and len(message) > 1:
-                    if message[1][0:3] == '...':
-                        message_head = re.sub(
-                            r'  ', r' ', message_head[:-3] + ' ' +
-                            message[1].split('\n')[0][3:])
-                # TODO: #5 revert: remove from selected_commits
-                url = commit.html_url
-                pulls = commit.get_pulls()
-                pr_links = []
-                if pulls.totalCount == 0:
-                    pass
-                else:
-                    for pull in pulls:
-                        pr = f''' ([#{pull.number}]({pull.html_url}))'''
-                        pr_links.append(pr)
-                selected_commits.append({
-                    'head': message_head,
-                    'sha': commit.sha,
-                    'url': url,
-                    'pr_links': pr_links
-                })
-        except github.GithubException as e:
-            if e.status == 403:
-                status_code = e.status
-                print("[ERROR] Failed to get release content, message:",
-                      e.data)
-                return '', status_code
-            else:
-                status_code = e.status
-                print("[ERROR] Failed to get release content, message:",
-                      e.data)
-                return '', status_code
-                # raise github.GithubException(e.status, e.data)
-        else:
-            release_content = generate_release_changelog(
-                self.releases[release_tag], selected_commits, release_tag,
-                self.part_name, self.default_scope, self.suppress_unscoped,
-                self.replace_empty_release_info)
-            return release_content, status_code
+        for commit in commits:
+            message = commit['message'].split('\n\n')
+            message_head = message[0]
+            if message_head[-3:] == '...' and len(message) > 1:
+                if message[1][0:3] == '...':
+                    fixed = message_head[:-3] + ' ' + message[1].split(
+                        '\n', 1)[0][3:]
+                    while '  ' in fixed:
+                        fixed = fixed.replace('  ', ' ')
+                    message_head = fixed
+            # TODO: #5 revert: remove from selected_commits
+            selected_commits.append({
+                'head': message_head,
+                'sha': commit['sha'],
+                'url': commit['url'],
+                'pr_links': commit['pr_links']
+            })
+        return generate_release_changelog(
+            self.releases[release_tag], selected_commits, release_tag,
+            self.part_name, self.default_scope, self.suppress_unscoped,
+            self.replace_empty_release_info)
 
     def read_releases(self):
         return self.releases
@@ -397,12 +631,12 @@ class GithubChangelog:
         '''
         Assemble the whole changelog from releases. Will not include the release if all things are empty.
         '''
-        changelog = BEGIN_CHANGELOG_TITLE
+        pieces = [BEGIN_CHANGELOG_TITLE]
         for release in self.releases.values():
             if release['content'] != '':
-                changelog += '\n\n' + release['content'].strip('\n')
-        changelog += '\n\n' + END_CHANGELOG_SIGNATURE + '\n'
-        return changelog
+                pieces.append('\n\n' + release['content'].strip('\n'))
+        pieces.append('\n\n' + END_CHANGELOG_SIGNATURE + '\n')
+        return ''.join(pieces)
 
     def write_data(self):
         changelog = self.assemble_changelog()
@@ -459,6 +693,7 @@ class GithubChangelog:
                                       head=self.branch,
                                       draft=False,
                                       maintainer_can_modify=True)
+        save_cache(CACHE_PATH, self._cache)
 
 
 def strip_commits(commits, type_regex, default_scope, suppress_unscoped):
@@ -467,7 +702,7 @@ def strip_commits(commits, type_regex, default_scope, suppress_unscoped):
 
     Args:
         commits (list): list of commit(dict), whose keys are 'head', 'sha', 'url', 'pr_links'
-        type_regex (string): regex expression to match.
+        type_regex (Pattern or str): precompiled type pattern, or the raw type to compile.
         default_scope (str): scope which matches all un-scoped commits
         suppress_unscoped (bool): flag which suppresses entries for un-scoped commits
 
@@ -475,25 +710,34 @@ def strip_commits(commits, type_regex, default_scope, suppress_unscoped):
         dict: selected commits of every scope.
     '''
     # TODO: add an attribute to ignore scope
-    regex = r'^' + type_regex + r'(?:[(](.+?)[)])?'
+    pat = type_regex if isinstance(type_regex, re.Pattern) else re.compile(
+        r'^' + type_regex + r'(?:[(](.+?)[)])?')
     scopes = {}
     for commit in commits:
         head = commit['head']
-        if re.match(regex, head):
-            scope = re.findall(regex, head)[0]
-            if scope == '':
-                if suppress_unscoped:
-                    continue
-                scope = default_scope
-            if scope.lower(
-            ) == 'changelog' and regex == r'^docs(?:[(](.+?)[)])?':
+        m = pat.match(head)
+        if not m:
+            continue
+        scope = m.group(1) or ''
+        if scope == '':
+            if suppress_unscoped:
                 continue
-            subject = re.sub(regex + r'\s?:\s?', '', head)
-            if scope in scopes:
-                scopes[scope].append({'subject': subject, 'commit': commit})
-            else:
-                scopes[scope] = []
-                scopes[scope].append({'subject': subject, 'commit': commit})
+            scope = default_scope
+        if scope.lower(
+        ) == 'changelog' and pat.pattern == r'^docs(?:[(](.+?)[)])?':
+            continue
+        # only strip the matched prefix when a colon separator follows it;
+        # heads that merely start with the type ('fixed the build') keep the
+        # whole head as the subject
+        rest = head[m.end():].lstrip()
+        if rest.startswith(':'):
+            subject = rest[1:].lstrip()
+        else:
+            subject = head
+        scopes.setdefault(scope, []).append({
+            'subject': subject,
+            'commit': commit
+        })
     return scopes
 
 
@@ -503,30 +747,29 @@ def generate_section(release_commits, regex, default_scope, suppress_unscoped):
 
     Args:
         release_commits (dict): commits of the release
-        regex (string): regex expression
+        regex (Pattern or str): precompiled type pattern, or the raw type to compile
         default_scope (str): scope which matches all un-scoped commits
         suppress_unscoped (bool): flag which suppresses entries for un-scoped commits
 
     Returns:
         string: content of section
     '''
-    section = ''
+    parts = []
     scopes = strip_commits(release_commits, regex, default_scope,
                            suppress_unscoped)
     for scope in scopes:
-        scope_content = f'''- {scope}:\n'''
+        parts.append(f'''- {scope}:\n''')
         for sel_commit in scopes[scope]:
             commit = sel_commit['commit']
             sha = commit['sha']
             url = commit['url']
             subject = sel_commit['subject']
             pr_links = commit['pr_links']
-            scope_content = scope_content + f'''  - {subject} ([{sha[0:7]}]({url}))'''
-            for pr_link in pr_links:
-                scope_content = scope_content + pr_link
-            scope_content = scope_content + '\n'
-        section = section + scope_content + '\n'
-    return section
+            parts.append(f'''  - {subject} ([{sha[0:7]}]({url}))''')
+            parts.extend(pr_links)
+            parts.append('\n')
+        parts.append('\n')
+    return ''.join(parts)
 
 
 def generate_release_body(release_commits, part_name, default_scope,
@@ -543,15 +786,16 @@ def generate_release_body(release_commits, part_name, default_scope,
     Returns:
         string: body part of release info
     '''
-    release_body = ''
+    sections = []
     # TODO: add a new attribute to ignore some commits with another new function
     for part in part_name:
-        regex, name = part.split(':')
-        sec = generate_section(release_commits, regex, default_scope,
+        type_regex, name = part.split(':')
+        pat = re.compile(r'^' + type_regex + r'(?:[(](.+?)[)])?')
+        sec = generate_section(release_commits, pat, default_scope,
                                suppress_unscoped)
         if sec != '':
-            release_body = release_body + '### ' + name + '\n\n' + sec
-    return release_body
+            sections.append('### ' + name + '\n\n' + sec)
+    return ''.join(sections)
 
 
 def generate_release_changelog(meta_data, release_commits, release_tag,
@@ -580,42 +824,10 @@ def generate_release_changelog(meta_data, release_commits, release_tag,
     else:
         title = release_tag
         url = meta_data['html_url']
-        origin_desc = re.split(
-            r'<!-- HIDE IN CHANGELOG BEGIN -->(?:.|\n)*?<!-- HIDE IN CHANGELOG END -->',
-            meta_data['body'])
-        if len(origin_desc) == 1:
-            description = origin_desc[0]
-        else:
-            description = ''
-            for elem in origin_desc:
-                if elem == origin_desc[0]:
-                    para = re.sub(r'\n*$', r'', elem)
-                    if para == '':
-                        continue
-                    elif description == '':
-                        description = para.strip('\n')
-                    else:
-                        description = description.strip(
-                            '\n') + '\n\n' + para.strip('\n')
-                elif elem == origin_desc[-1]:
-                    para = re.sub(r'^\n*', r'', elem)
-                    if para == '':
-                        continue
-                    elif description == '':
-                        description = para.strip('\n')
-                    else:
-                        description = description.strip(
-                            '\n') + '\n\n' + para.strip('\n')
-                else:
-                    para = re.sub(r'\n*$', r'', elem)
-                    para = re.sub(r'^\n*', r'', para)
-                    if para == '':
-                        continue
-                    elif description == '':
-                        description = para.strip('\n')
-                    else:
-                        description = description.strip(
-                            '\n') + '\n\n' + para.strip('\n')
+        # drop the hidden blocks in one pass and collapse the blank-line runs
+        # the removal leaves behind
+        description = _MULTI_NL.sub(
+            '\n\n', _HIDE.sub('', meta_data['body'])).strip('\n')
         date = meta_data['created_at']
         if description == '':
             description = replace_empty_release_info
@@ -640,7 +852,7 @@ def main():
         pass
     else:
         print("Illegal mode option, please type \'-h\' to read the help")
-        os.exit()
+        sys.exit()
 
     ACCESS_TOKEN = get_inputs('ACCESS_TOKEN')
     REPO_NAME = get_inputs('REPO_NAME')
@@ -653,7 +865,7 @@ def main():
     PULL_REQUEST = get_inputs('PULL_REQUEST')
     COMMIT_MESSAGE = get_inputs('COMMIT_MESSAGE')
     COMMITTER = get_inputs('COMMITTER')
-    part_name = re.split(r'\s?,\s?', get_inputs('TYPE'))
+    part_name = _TYPE_SPLIT.split(get_inputs('TYPE'))
     DEFAULT_SCOPE = get_inputs('DEFAULT_SCOPE')
     SUPPRESS_UNSCOPED = get_inputs('SUPPRESS_UNSCOPED')
     UNRELEASED_COMMITS = get_inputs('UNRELEASED_COMMITS')